@@ -4,6 +4,7 @@ Main script for STEP Contact Matrix Analyzer
 Usage:
     python main.py                         # Analyze default file (step_files/knife.step)
     python main.py <file.step>             # Analyze specified STEP file
+    python main.py <a.step> <b.step> ...   # Analyze several STEP files
     python main.py test                    # Run test suite
 """
 
@@ -14,42 +15,137 @@ from pathlib import Path
 # Default STEP file to analyze
 DEFAULT_STEP_FILE = "step_files/knife.step"
 
+# Folder for cached contact matrices, and the version of their contents;
+# bump the version whenever the contact rules or the cache format change
+CACHE_DIR = Path("results/cache")
+CACHE_VERSION = 1
+
 def show_help():
     """Display help information"""
     print(__doc__)
 
 
-def analyze_step_file(file_path):
-    """Analyze a STEP file"""
+def analyze_step_file(file_path, n_workers=None, show=True):
+    """Analyze a STEP file (n_workers defaults to the config.py parallel settings)"""
+    from config import COMPUTE_CENTRALITY, FIND_BRIDGES, MAX_PARTS_FOR_DETAILED_ANALYSIS
     from step_contact_analyzer import STEPContactAnalyzer
     
+    if n_workers is None:
+        from config import PARALLEL_PROCESSING, MAX_WORKERS
+        n_workers = MAX_WORKERS if PARALLEL_PROCESSING else 1
+    
     if not os.path.exists(file_path):
         print(f"Error: File not found: {file_path}")
         return False
     
     print(f"Analyzing STEP file: {file_path}")
     
-    analyzer = STEPContactAnalyzer(tolerance=1e-3)
+    analyzer = STEPContactAnalyzer(tolerance=1e-3, n_workers=n_workers)
+    file_stem = Path(file_path).stem
     
-    if analyzer.load_step_file(file_path):
+    # Reuse the contact matrix of a previous run on the unchanged file
+    stat = os.stat(file_path)
+    cache_path = CACHE_DIR / (
+        f"{file_stem}_v{CACHE_VERSION}_{stat.st_mtime_ns}_{stat.st_size}_{analyzer.tolerance}.pkl.gz"
+    )
+    cached = _load_cached_analysis(cache_path)
+    
+    if cached is not None:
+        analyzer.part_names, analyzer.contact_matrix = cached
+        print(f"Loaded cached analysis of {len(analyzer.part_names)} parts")
+    elif analyzer.load_step_file(file_path):
         print(f"Loaded {len(analyzer.parts)} parts")
         
         # Compute contact matrix
         analyzer.compute_contact_matrix()
         
-        # Generate visualization
-        file_stem = Path(file_path).stem
-        output_path = f"results/{file_stem}_analysis.png"
-        analyzer.visualize_contact_graph(save_path=output_path)
-        
-        # Print summary
-        analyzer.print_contact_summary()
-        
-        print(f"\nVisualization saved as: {output_path}")
-        return True
+        _save_cached_analysis(cache_path, file_stem, analyzer.part_names, analyzer.contact_matrix)
     else:
         print("Failed to load STEP file")
         return False
+    
+    # Generate visualization
+    output_path = f"results/{file_stem}_analysis.png"
+    analyzer.visualize_contact_graph(save_path=output_path, show=show)
+    
+    # Print summary
+    analyzer.print_contact_summary(show_bridges=FIND_BRIDGES, show_centrality=COMPUTE_CENTRALITY,
+                                   max_detailed_parts=MAX_PARTS_FOR_DETAILED_ANALYSIS)
+    
+    print(f"\nVisualization saved as: {output_path}")
+    return True
+
+
+def _load_cached_analysis(cache_path):
+    """Return the cached (part_names, contact_matrix), or None on a cache miss"""
+    import gzip
+    import pickle
+    
+    if not cache_path.exists():
+        return None
+    
+    try:
+        with gzip.open(cache_path, "rb") as f:
+            cached = pickle.load(f)
+        part_names, contact_matrix = cached
+    except (EOFError, OSError, ValueError, TypeError, pickle.UnpicklingError):
+        # Truncated, corrupt or foreign cache entry: recompute and overwrite it
+        print(f"Ignoring unreadable cache file: {cache_path}")
+        return None
+    
+    return part_names, contact_matrix
+
+
+def _save_cached_analysis(cache_path, file_stem, part_names, contact_matrix):
+    """Atomically write a cache entry and remove older entries for the same file"""
+    import gzip
+    import pickle
+    import re
+    import tempfile
+    
+    # Write to a temporary file and rename it, so concurrent runs and
+    # interrupted writes never leave a partial cache entry behind
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=cache_path.parent, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb") as f:
+            pickle.dump((part_names, contact_matrix), f)
+        os.replace(tmp_path, cache_path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+    
+    # Entries for earlier versions of the file (other mtime, size, tolerance
+    # or cache version) can never be hit again
+    stale = re.compile(rf"{re.escape(file_stem)}_(v\d+_)?\d+_\d+_[^_]+\.pkl\.gz")
+    for path in cache_path.parent.iterdir():
+        if path != cache_path and stale.fullmatch(path.name):
+            path.unlink(missing_ok=True)
+
+
+def _init_worker():
+    """Use a non-interactive plotting backend in worker processes"""
+    import matplotlib
+    matplotlib.use("Agg")
+
+
+def analyze_step_files(file_paths):
+    """Analyze several STEP files, in parallel if enabled in config.py"""
+    from config import PARALLEL_PROCESSING, MAX_WORKERS
+    
+    if PARALLEL_PROCESSING and len(file_paths) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        
+        # Each file is loaded and analyzed independently, so workers share no OCC
+        # state; files are already spread over the pool, so each runs serially
+        # and only saves its plot
+        n_files = len(file_paths)
+        with ProcessPoolExecutor(max_workers=MAX_WORKERS, initializer=_init_worker) as executor:
+            results = list(executor.map(analyze_step_file, file_paths, [1] * n_files, [False] * n_files))
+    else:
+        results = [analyze_step_file(file_path) for file_path in file_paths]
+    
+    return all(results)
 
 
 def run_tests():
@@ -91,8 +187,11 @@ def main():
     
     # Check if it's a file path (ends with .step or .stp, or exists as file)
     elif command.endswith(('.step', '.stp')) or os.path.exists(sys.argv[1]):
-        file_path = sys.argv[1]
-        success = analyze_step_file(file_path)
+        file_paths = sys.argv[1:]
+        if len(file_paths) == 1:
+            success = analyze_step_file(file_paths[0])
+        else:
+            success = analyze_step_files(file_paths)
         sys.exit(0 if success else 1)
     
     # Unknown command
@@ -13,7 +13,8 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent))
 
 from step_contact_analyzer import STEPContactAnalyzer
-from utils import analyze_contact_matrix_properties
+from utils import (analyze_contact_matrix_properties, compute_centralities, compute_layout,
+                   export_contact_matrix_csv, find_bridges, load_contact_matrix_csv)
 
 
 def test_synthetic_data():
@@ -107,6 +108,266 @@ def test_utilities():
     print("✓ Utilities test passed")
 
 
+def test_bridges():
+    """Test critical contact (bridge) detection"""
+    print("Testing bridge detection...")
+    
+    # Triangle 0-1-2 with a tail 2-3-4 and an isolated part 5
+    contact_matrix = np.array([
+        [1, 1, 1, 0, 0, 0],
+        [1, 1, 1, 0, 0, 0],
+        [1, 1, 1, 1, 0, 0],
+        [0, 0, 1, 1, 1, 0],
+        [0, 0, 0, 1, 1, 0],
+        [0, 0, 0, 0, 0, 1]
+    ])
+    
+    bridges = sorted(find_bridges(contact_matrix))
+    assert bridges == [(2, 3), (3, 4)], f"Wrong bridges: {bridges}"
+    
+    print("✓ Bridge detection test passed")
+
+
+def test_centralities():
+    """Test centrality computation"""
+    print("Testing centrality measures...")
+    
+    import networkx as nx
+    
+    # Chain of three parts: the middle part lies on every shortest path
+    G = nx.path_graph(3)
+    degree, betweenness, closeness = compute_centralities(G)
+    
+    assert degree == {0: 0.5, 1: 1.0, 2: 0.5}, "Wrong degree centrality"
+    assert betweenness == {0: 0.0, 1: 1.0, 2: 0.0}, "Wrong betweenness centrality"
+    assert abs(closeness[0] - 2 / 3) < 1e-6 and closeness[1] == 1.0, "Wrong closeness centrality"
+    
+    print("✓ Centrality test passed")
+
+
+def test_csv_roundtrip():
+    """Test contact matrix CSV export and import"""
+    print("Testing CSV export and import...")
+    
+    import tempfile
+    
+    part_names = ["Blade", "Handle, left", "Rivet"]
+    contact_matrix = np.array([
+        [1, 1, 0],
+        [1, 1, 1],
+        [0, 1, 1]
+    ], dtype=np.uint8)
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "contact_matrix.csv")
+        export_contact_matrix_csv(contact_matrix, part_names, file_path)
+        loaded_matrix, loaded_names = load_contact_matrix_csv(file_path)
+    
+    assert loaded_names == part_names, "Part names changed in roundtrip"
+    assert np.array_equal(loaded_matrix, contact_matrix), "Matrix changed in roundtrip"
+    
+    print("✓ CSV roundtrip test passed")
+
+
+def test_layout():
+    """Test graph layout computation"""
+    print("Testing graph layout...")
+    
+    import networkx as nx
+    
+    G = nx.path_graph(5)
+    pos = compute_layout(G)
+    
+    assert len(pos) == 5, "Wrong number of positions"
+    assert all(np.all(np.isfinite(p)) for p in pos.values()), "Non-finite position"
+    
+    # Named layouts as returned by get_recommended_layout
+    G = nx.cycle_graph(12)
+    for layout in ('fruchterman_reingold', 'kamada_kawai', 'spectral', 'circular'):
+        pos = compute_layout(G, layout=layout)
+        assert len(pos) == 12, f"Wrong number of positions for {layout}"
+    
+    # Cached layouts are reused, and corrupt or mismatched entries recomputed
+    import tempfile
+    with tempfile.TemporaryDirectory() as cache_dir:
+        expected = compute_layout(G, cache_dir=cache_dir)
+        entries = list(Path(cache_dir).iterdir())
+        assert len(entries) == 1 and entries[0].suffix == '.npz', "Expected one cached layout"
+        
+        np.savez(entries[0], pos=np.ones((12, 2)))
+        pos = compute_layout(G, cache_dir=cache_dir)
+        assert all(np.all(pos[node] == 1) for node in G), "Cached layout not reused"
+        
+        # Truncated file, then an entry with the wrong number of positions
+        for corrupt in (lambda path: path.write_bytes(b'PK\x03\x04 truncated'),
+                        lambda path: np.savez(path, pos=np.ones((3, 2)))):
+            corrupt(entries[0])
+            pos = compute_layout(G, cache_dir=cache_dir)
+            assert all(np.allclose(pos[node], expected[node]) for node in G), "Bad cache entry not recomputed"
+            assert list(Path(cache_dir).iterdir()) == entries, "Unexpected files in layout cache"
+        
+        with np.load(entries[0]) as data:
+            assert len(data['pos']) == 12, "Bad cache entry not overwritten"
+    
+    print("✓ Layout test passed")
+
+
+def test_broad_phase():
+    """Test bounding sphere and box filtering against the dense conditions"""
+    print("Testing contact broad phase...")
+    
+    import step_contact_analyzer
+    
+    # Small random boxes, one box enclosing them all and one unbounded part
+    rng = np.random.default_rng(0)
+    lo = rng.uniform(0, 10, size=(60, 3))
+    bounds = np.hstack([lo, lo + rng.uniform(0.1, 1.5, size=(60, 3))]).tolist()
+    bounds.append((-1, -1, -1, 12, 12, 12))
+    bounds.append((-np.inf,) * 3 + (np.inf,) * 3)
+    n_parts = len(bounds)
+    
+    analyzer = STEPContactAnalyzer(tolerance=0.05)
+    analyzer.parts = list(range(n_parts))
+    analyzer._set_bounds(bounds)
+    analyzer._are_parts_in_contact = lambda part1, part2: True
+    
+    tol = analyzer.tolerance
+    i, j = np.triu_indices(n_parts, k=1)
+    distance = np.linalg.norm(analyzer.centers[i] - analyzer.centers[j], axis=1)
+    sphere = distance <= analyzer.radii[i] + analyzer.radii[j] + tol
+    box = (np.all(analyzer.bb_min[i] <= analyzer.bb_max[j] + tol, axis=1) &
+           np.all(analyzer.bb_max[i] + tol >= analyzer.bb_min[j], axis=1))
+    
+    # Force several row blocks so block boundaries are exercised
+    block_elements = step_contact_analyzer.SPHERE_BLOCK_ELEMENTS
+    step_contact_analyzer.SPHERE_BLOCK_ELEMENTS = 7 * n_parts
+    try:
+        i_idx, j_idx = analyzer._sphere_candidate_pairs()
+        contact_matrix = analyzer.compute_contact_matrix()
+    finally:
+        step_contact_analyzer.SPHERE_BLOCK_ELEMENTS = block_elements
+    
+    assert set(zip(i_idx.tolist(), j_idx.tolist())) == set(zip(i[sphere].tolist(), j[sphere].tolist())), \
+        "Sphere filter differs from dense test"
+    
+    expected = np.eye(n_parts, dtype=np.uint8)
+    expected[i[sphere & box], j[sphere & box]] = 1
+    expected[j[sphere & box], i[sphere & box]] = 1
+    assert np.array_equal(contact_matrix, expected), "Broad phase differs from dense test"
+    assert np.all(contact_matrix[-1] == 1), "Unbounded part was filtered out"
+    
+    print("✓ Broad phase test passed")
+
+
+def test_parallel_chunks():
+    """Test chunking and scattering of parallel contact checks"""
+    print("Testing parallel contact checks...")
+    
+    from unittest import mock
+    import step_contact_analyzer
+    
+    class SerialExecutor:
+        """Runs map() in-process, recording the worker initializer arguments"""
+        def __init__(self, max_workers=None, initializer=None, initargs=()):
+            SerialExecutor.initargs = initargs
+        def __enter__(self):
+            return self
+        def __exit__(self, *exc):
+            return False
+        def map(self, fn, *iterables):
+            return map(fn, *iterables)
+    
+    n_parts = 9
+    analyzer = STEPContactAnalyzer(tolerance=0.1, n_workers=3)
+    analyzer.parts = list(range(n_parts))
+    analyzer.file_path = "assembly.step"
+    candidates = np.column_stack(np.triu_indices(n_parts, k=1))
+    
+    # Stub contact rule and face counts that depend on the part indices only
+    check_pairs = lambda pairs: [(i * j) % 3 == 1 for i, j in pairs]
+    with mock.patch("concurrent.futures.ProcessPoolExecutor", SerialExecutor), \
+         mock.patch.object(step_contact_analyzer, "_check_pairs", check_pairs), \
+         mock.patch.object(step_contact_analyzer, "_count_faces", lambda part: part % 4 + 1):
+        in_contact = analyzer._check_pairs_parallel(candidates)
+    
+    expected = np.array([(i * j) % 3 == 1 for i, j in candidates.tolist()])
+    assert np.array_equal(in_contact, expected), "Parallel results scattered to wrong pairs"
+    assert SerialExecutor.initargs == ("assembly.step", 0.1, n_parts), "Wrong worker arguments"
+    
+    # Workers must refuse a file they cannot read or that changed underneath them
+    for solids, error in ((None, IOError), ([object()] * (n_parts - 1), ValueError)):
+        with mock.patch.object(step_contact_analyzer, "_read_solids", lambda path: solids):
+            try:
+                step_contact_analyzer._init_contact_worker("assembly.step", 0.1, n_parts)
+            except error:
+                pass
+            else:
+                raise AssertionError("Worker accepted mismatched parts")
+    
+    print("✓ Parallel contact test passed")
+
+
+def test_analysis_cache():
+    """Test the contact matrix cache of main.analyze_step_file"""
+    print("Testing analysis cache...")
+    
+    import gzip
+    import pickle
+    import tempfile
+    from unittest import mock
+    import main
+    
+    def load_step_file(self, file_path):
+        self.file_path = file_path
+        self.parts = [0, 1, 2]
+        self.part_names = ["Blade", "Handle", "Pin"]
+        self._set_bounds([(0, 0, 0, 1, 1, 1), (1, 0, 0, 2, 1, 1), (5, 5, 5, 6, 6, 6)])
+        return True
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        step_path = Path(tmp_dir) / "knife.step"
+        step_path.write_text("ISO-10303-21;")
+        cache_dir = Path(tmp_dir) / "cache"
+        
+        with mock.patch.object(main, "CACHE_DIR", cache_dir), \
+             mock.patch.object(STEPContactAnalyzer, "load_step_file", autospec=True,
+                               side_effect=load_step_file) as load, \
+             mock.patch.object(STEPContactAnalyzer, "_are_parts_in_contact",
+                               lambda self, part1, part2: True), \
+             mock.patch.object(STEPContactAnalyzer, "visualize_contact_graph"), \
+             mock.patch.object(STEPContactAnalyzer, "print_contact_summary"):
+            def run():
+                assert main.analyze_step_file(str(step_path), n_workers=1, show=False)
+                return sorted(cache_dir.iterdir())
+            
+            # Miss, then hit; the entry is written without leftover temp files
+            entries = run()
+            assert load.call_count == 1, "First run should analyze the file"
+            assert len(entries) == 1 and entries[0].name.endswith(".pkl.gz"), "Expected one cache entry"
+            assert f"_v{main.CACHE_VERSION}_" in entries[0].name, "Cache key lacks the version"
+            with gzip.open(entries[0], "rb") as f:
+                part_names, contact_matrix = pickle.load(f)
+            assert part_names == ["Blade", "Handle", "Pin"], "Wrong cached part names"
+            assert contact_matrix.tolist() == [[1, 1, 0], [1, 1, 0], [0, 0, 1]], "Wrong cached matrix"
+            
+            assert run() == entries, "Cache hit should not rewrite entries"
+            assert load.call_count == 1, "Second run should use the cache"
+            
+            # Corrupt and foreign entries are recomputed and overwritten
+            for content in (b"\x1f\x8b truncated", gzip.compress(pickle.dumps(["not", "a", "pair"]))):
+                entries[0].write_bytes(content)
+                calls = load.call_count
+                assert run() == entries, "Recomputed entry should replace the bad one"
+                assert load.call_count == calls + 1, "Bad cache entry should be a miss"
+            
+            # Editing the file creates a new entry and prunes the stale one
+            os.utime(step_path, ns=(0, 10**18))
+            new_entries = run()
+            assert len(new_entries) == 1 and new_entries != entries, "Stale cache entry not pruned"
+    
+    print("✓ Analysis cache test passed")
+
+
 def main():
     """Run all tests"""
     print("STEP Contact Matrix Analyzer - Test Suite")
@@ -117,6 +378,13 @@ def main():
         test_step_file_loading()
         test_graph_creation()
         test_utilities()
+        test_bridges()
+        test_centralities()
+        test_csv_roundtrip()
+        test_layout()
+        test_broad_phase()
+        test_parallel_chunks()
+        test_analysis_cache()
         
         print("\n" + "=" * 50)
         print("✓ All tests passed successfully!")
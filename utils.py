@@ -20,13 +20,16 @@ def analyze_contact_matrix_properties(contact_matrix: np.ndarray) -> dict:
     """
     n_parts = contact_matrix.shape[0]
     
+    # Single pass over the matrix; everything else derives from the row sums
+    row_sums = np.sum(contact_matrix, axis=1, dtype=np.int64)
+    
     # Basic properties
-    total_contacts = np.sum(contact_matrix) // 2  # Divide by 2 for symmetry
+    total_contacts = row_sums.sum() // 2  # Divide by 2 for symmetry
     max_possible_contacts = n_parts * (n_parts - 1) // 2
     density = total_contacts / max_possible_contacts if max_possible_contacts > 0 else 0
     
     # Connectivity analysis
-    degree_sequence = np.sum(contact_matrix, axis=1) - 1  # Subtract diagonal
+    degree_sequence = row_sums - 1  # Subtract diagonal
     max_connections = np.max(degree_sequence)
     min_connections = np.min(degree_sequence)
     avg_connections = np.mean(degree_sequence)
@@ -45,6 +48,150 @@ def analyze_contact_matrix_properties(contact_matrix: np.ndarray) -> dict:
     }
 
 
+def edges_from_matrix(contact_matrix: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    List the contacts in a contact matrix as edges
+
+    Args:
+        contact_matrix: Binary contact matrix
+
+    Returns:
+        List of (i, j) part index pairs with i < j, for use with G.add_edges_from()
+    """
+    # Cast to bool so weighted or non-0/1 matrices still yield one edge per contact
+    upper = np.triu(np.asarray(contact_matrix, dtype=bool), k=1)
+    return [tuple(edge) for edge in np.argwhere(upper).tolist()]
+
+
+def find_bridges(contact_matrix: np.ndarray) -> List[Tuple[int, int]]:
+    """
+    Find critical contacts (graph bridges) whose removal disconnects the assembly
+
+    Runs an iterative Tarjan depth-first search over the CSR adjacency arrays
+    of the contact matrix instead of NetworkX's per-edge dictionaries.
+
+    Args:
+        contact_matrix: Binary contact matrix
+
+    Returns:
+        List of (i, j) part index pairs with i < j
+    """
+    from scipy.sparse import csr_matrix
+
+    adjacency = np.array(contact_matrix, dtype=bool)
+    np.fill_diagonal(adjacency, False)
+    csr = csr_matrix(adjacency)
+    indptr = csr.indptr.tolist()
+    indices = csr.indices.tolist()
+
+    n_parts = adjacency.shape[0]
+    discovery = [-1] * n_parts
+    low = [0] * n_parts
+    timer = 0
+    bridges = []
+
+    for root in range(n_parts):
+        if discovery[root] != -1:
+            continue
+
+        discovery[root] = low[root] = timer
+        timer += 1
+        # Stack entries: (node, parent, next neighbor offset into indices)
+        stack = [(root, -1, indptr[root])]
+
+        while stack:
+            node, parent, ptr = stack[-1]
+            if ptr < indptr[node + 1]:
+                stack[-1] = (node, parent, ptr + 1)
+                neighbor = indices[ptr]
+                if discovery[neighbor] == -1:
+                    discovery[neighbor] = low[neighbor] = timer
+                    timer += 1
+                    stack.append((neighbor, node, indptr[neighbor]))
+                elif neighbor != parent:
+                    low[node] = min(low[node], discovery[neighbor])
+            else:
+                stack.pop()
+                if parent != -1:
+                    low[parent] = min(low[parent], low[node])
+                    if low[node] > discovery[parent]:
+                        bridges.append((min(parent, node), max(parent, node)))
+
+    return sorted(bridges)
+
+
+def compute_centralities(G) -> Tuple[dict, dict, dict]:
+    """
+    Compute degree, betweenness and closeness centrality of a contact graph
+
+    Betweenness and closeness share one breadth-first search per source node
+    (Brandes' algorithm), instead of running separate all-pairs shortest path
+    searches for each measure. Values match NetworkX's normalized defaults.
+
+    Args:
+        G: Undirected, unweighted NetworkX graph
+
+    Returns:
+        Tuple of (degree, betweenness, closeness) dictionaries keyed by node
+    """
+    from collections import deque
+
+    nodes = list(G)
+    n_nodes = len(nodes)
+    index = {node: i for i, node in enumerate(nodes)}
+    neighbors = [[index[nbr] for nbr in G[node] if nbr != node] for node in nodes]
+
+    betweenness = [0.0] * n_nodes
+    closeness = [0.0] * n_nodes
+
+    for source in range(n_nodes):
+        # Single-source shortest paths, recording path counts and predecessors
+        order = []
+        predecessors = [[] for _ in range(n_nodes)]
+        sigma = [0] * n_nodes
+        sigma[source] = 1
+        distance = [-1] * n_nodes
+        distance[source] = 0
+        queue = deque([source])
+
+        while queue:
+            v = queue.popleft()
+            order.append(v)
+            for w in neighbors[v]:
+                if distance[w] < 0:
+                    distance[w] = distance[v] + 1
+                    queue.append(w)
+                if distance[w] == distance[v] + 1:
+                    sigma[w] += sigma[v]
+                    predecessors[w].append(v)
+
+        # Closeness from the same distances (Wasserman-Faust scaling)
+        total_distance = sum(distance[v] for v in order)
+        reachable = len(order) - 1
+        if total_distance > 0 and n_nodes > 1:
+            closeness[source] = (reachable / total_distance) * (reachable / (n_nodes - 1))
+
+        # Accumulate pair dependencies in reverse BFS order
+        delta = [0.0] * n_nodes
+        for w in reversed(order):
+            coefficient = (1.0 + delta[w]) / sigma[w]
+            for v in predecessors[w]:
+                delta[v] += sigma[v] * coefficient
+            if w != source:
+                betweenness[w] += delta[w]
+
+    if n_nodes > 2:
+        scale = 1.0 / ((n_nodes - 1) * (n_nodes - 2))
+        betweenness = [value * scale for value in betweenness]
+
+    if n_nodes > 1:
+        degree = {node: len(neighbors[i]) / (n_nodes - 1) for i, node in enumerate(nodes)}
+    else:
+        degree = {node: 1.0 for node in nodes}
+
+    return degree, dict(zip(nodes, betweenness)), dict(zip(nodes, closeness))
+
+
 def export_contact_matrix_csv(contact_matrix: np.ndarray, part_names: List[str], filename: str = None):
     """
     Export contact matrix to CSV file
@@ -69,10 +216,9 @@ def export_contact_matrix_csv(contact_matrix: np.ndarray, part_names: List[str],
         # Write header
         writer.writerow([''] + part_names)
         
-        # Write matrix rows
-        for i, part_name in enumerate(part_names):
-            row = [part_name] + contact_matrix[i].tolist()
-            writer.writerow(row)
+        # Write matrix rows (one conversion of the whole matrix to Python ints)
+        rows = np.asarray(contact_matrix).tolist()
+        writer.writerows([part_name] + row for part_name, row in zip(part_names, rows))
     
     print(f"Contact matrix exported to {file_path}")
     return file_path
@@ -90,19 +236,13 @@ def load_contact_matrix_csv(filename: str) -> Tuple[np.ndarray, List[str]]:
     """
     import csv
     
-    with open(filename, 'r') as csvfile:
-        reader = csv.reader(csvfile)
-        rows = list(reader)
-    
-    # Extract part names from header (skip first empty cell)
-    part_names = rows[0][1:]
-    
-    # Extract matrix data
-    matrix_data = []
-    for row in rows[1:]:
-        matrix_data.append([int(x) for x in row[1:]])
-    
-    contact_matrix = np.array(matrix_data)
+    with open(filename, 'r', newline='') as csvfile:
+        # Extract part names from header (skip first empty cell)
+        part_names = next(csv.reader(csvfile))[1:]
+        
+        # Parse the matrix body in NumPy's C reader, skipping the name column
+        contact_matrix = np.loadtxt(csvfile, delimiter=',', quotechar='"', dtype=np.uint8,
+                                    usecols=range(1, len(part_names) + 1), ndmin=2)
     
     return contact_matrix, part_names
 
@@ -124,11 +264,10 @@ def validate_step_file(file_path: str) -> bool:
     if not file_path.lower().endswith(('.step', '.stp')):
         return False
     
-    # Check file header
+    # Check file header (raw bytes, no decoding of the file needed)
     try:
-        with open(file_path, 'r') as f:
-            first_line = f.readline().strip()
-            return first_line.startswith('ISO-10303')
+        with open(file_path, 'rb') as f:
+            return f.read(64).lstrip().startswith(b'ISO-10303')
     except:
         return False
 
@@ -153,6 +292,84 @@ def get_recommended_layout(n_nodes: int) -> str:
         return 'spectral'
 
 
+def compute_layout(G, layout: str = 'spring', k: float = None, iterations: int = 50,
+                   seed: int = 42, cache_dir: str = None) -> dict:
+    """
+    Compute node positions for a contact graph
+
+    Layouts are computed with NetworkX and can be cached on disk, so repeated
+    runs on the same contact graph skip the layout step.
+
+    Args:
+        G: NetworkX graph
+        layout: Layout name: spring, fruchterman_reingold (spring with at most
+            20 iterations), kamada_kawai, spectral or circular
+            (see get_recommended_layout)
+        k: Optimal distance between nodes for spring layouts (if None, uses 1/sqrt(n))
+        iterations: Maximum number of iterations for spring layouts
+        seed: Random seed for the initial positions
+        cache_dir: Optional folder for caching layouts as .npz files, keyed by
+            a hash of the adjacency matrix and the layout parameters
+
+    Returns:
+        Dictionary mapping nodes to 2D positions
+    """
+    import networkx as nx
+
+    if layout == 'fruchterman_reingold':
+        layout, iterations = 'spring', min(iterations, 20)
+    if layout not in ('spring', 'kamada_kawai', 'spectral', 'circular'):
+        raise ValueError(f"Unknown layout: {layout}")
+
+    nodes = list(G)
+    n_nodes = len(nodes)
+
+    cache_path = None
+    if cache_dir is not None:
+        import hashlib
+        import zipfile
+
+        A = nx.to_numpy_array(G, nodelist=nodes, weight=None, dtype=np.uint8)
+        params = (layout, k, iterations, seed)
+        key = hashlib.blake2b(A.tobytes() + repr(params).encode()).hexdigest()
+        cache_path = Path(cache_dir) / f"{key}.npz"
+        if cache_path.exists():
+            try:
+                with np.load(cache_path) as data:
+                    positions = data["pos"]
+                if len(positions) == n_nodes:
+                    return dict(zip(nodes, positions))
+            except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+                # Unreadable cache entry: recompute and overwrite it
+                pass
+
+    if layout == 'kamada_kawai':
+        pos = nx.kamada_kawai_layout(G)
+    elif layout == 'spectral':
+        pos = nx.spectral_layout(G)
+    elif layout == 'circular':
+        pos = nx.circular_layout(G)
+    else:
+        pos = nx.spring_layout(G, k=k, iterations=iterations, seed=seed)
+
+    if cache_path is not None:
+        import tempfile
+
+        # Save under a temporary name and rename, so readers never see a
+        # partially written file
+        Path(cache_dir).mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.savez(f, pos=np.array([pos[node] for node in nodes]))
+            os.replace(tmp_path, cache_path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    return pos
+
+
 if __name__ == "__main__":
     # Test utility functions if run directly
     print("STEP Contact Matrix Analyzer - Utilities")